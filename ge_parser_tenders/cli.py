@@ -2,10 +2,35 @@ import argparse
 import logging
 import sys
 import json
+import shutil
 from pathlib import Path
 from collections.abc import Iterable
 from .scraper import scrape_tenders
 from .config import ParserSettings
+from .extractor import TEXT_CACHE_DIR
+from .scan_cache import SCAN_CACHE_PATH
+
+_SHM_MIN_FREE = 1 << 30          # байт; в Docker /dev/shm по умолчанию 64 МиБ
+
+
+def _default_tmp_dir() -> str | None:
+    """
+    tmpfs в RAM: вложения читаются один раз и сразу удаляются. Если места
+    там меньше _SHM_MIN_FREE — системный temp: на ENOSPC файл пропустился
+    бы, а тендер всё равно записался бы в просмотренные.
+    """
+    shm = Path("/dev/shm")
+    if not shm.is_dir():
+        return None
+    try:
+        free = shutil.disk_usage(shm).free
+    except OSError:
+        return None
+    if free < _SHM_MIN_FREE:
+        logging.debug("/dev/shm: свободно %d байт — берём системный temp", free)
+        return None
+    return str(shm)
+
 
 def main(argv: Iterable[str] | None = None):
     # --- 0. Предварительный парсер, чтобы узнать путь к конфигу ---
@@ -36,6 +61,27 @@ def main(argv: Iterable[str] | None = None):
         default=settings.max_pages,
         help="Stop after N results pages",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.workers,
+        help="Scrape N result pages in parallel, one Chrome per process",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=settings.scan_workers,
+        help="Processes that scan downloaded files for keywords "
+             "(per page process when --workers > 1)",
+    )
+    parser.add_argument(
+        "--tmp-dir",
+        default=settings.tmp_dir or _default_tmp_dir(),
+        help="Where to keep downloaded attachments while they are scanned "
+             "(default: RAM-backed /dev/shm if it has at least 1 GiB free, "
+             "else the system temp dir; needs room for one tender's files "
+             "per Chrome)",
+    )
     parser.add_argument(
         "--no-headless",
         action="store_true",
@@ -47,6 +93,13 @@ def main(argv: Iterable[str] | None = None):
         default=settings.reset_cache,
         help="Удалить visited_ids.txt перед началом работы",
     )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        default=settings.clear_cache,
+        help="Удалить .text_cache (извлечённый текст) и scanned_files.sqlite "
+             "(результаты проверки файлов) перед началом работы",
+    )
     parser.add_argument(
         "--log",
         default=settings.log,
@@ -64,6 +117,13 @@ def main(argv: Iterable[str] | None = None):
     if args.reset_cache and cache_file.exists():
         cache_file.unlink()
         print("Cache reset: removed visited_ids.txt")
+    if args.clear_cache:
+        if TEXT_CACHE_DIR.exists():
+            shutil.rmtree(TEXT_CACHE_DIR)
+            print(f"Cache cleared: removed {TEXT_CACHE_DIR}/")
+        for db_file in SCAN_CACHE_PATH.parent.glob(f"{SCAN_CACHE_PATH.name}*"):
+            db_file.unlink()                # вместе с -wal / -shm
+            print(f"Cache cleared: removed {db_file}")
 
     # --- 4. Логирование ---
     logging.basicConfig(
@@ -71,13 +131,41 @@ def main(argv: Iterable[str] | None = None):
         format="%(levelname)s: %(message)s",
     )
 
+    # --- 5. Найденные ID пишутся построчно (NDJSON) по мере нахождения ---
+    #     при падении частичный результат остаётся в <output>.ndjson; эти
+    #     тендеры уже в visited_ids.txt, поэтому следующий прогон файл
+    #     дописывает, а не затирает, и вливает его ID в итоговый --output
+    partial_path = Path(output_path).with_suffix(".ndjson")
+    earlier: list[str] = []
+    pending_text = partial_path.read_text(encoding="utf-8") if partial_path.exists() else ""
+    for line in pending_text.splitlines():
+        try:
+            earlier.append(json.loads(line))
+        except json.JSONDecodeError:
+            pass                            # строка, оборванная падением
+    if earlier:
+        logging.info("Resuming: %d IDs from the previous run → %s", len(earlier), partial_path)
+
     logging.info("Starting scraperrrrrrrrrrrrrrrr…")
-    try:
-        ids = scrape_tenders(max_pages=max_pages, headless=headless, settings=settings)
-    except KeyboardInterrupt:
-        sys.exit("Interrupted by user")
+    with partial_path.open("a", encoding="utf-8", buffering=1) as partial:
+        if pending_text and not pending_text.endswith("\n"):
+            partial.write("\n")
+        try:
+            ids = scrape_tenders(
+                max_pages=max_pages,
+                headless=headless,
+                workers=args.workers,
+                scan_workers=args.scan_workers,
+                tmp_dir=args.tmp_dir,
+                on_hit=lambda tid: partial.write(json.dumps(tid, ensure_ascii=False) + "\n"),
+                settings=settings,
+            )
+        except KeyboardInterrupt:
+            sys.exit(f"Interrupted by user; IDs found so far → {partial_path}")
 
+    ids = list(dict.fromkeys(earlier + ids))
     Path(output_path).write_text(json.dumps(ids, indent=2, ensure_ascii=False))
+    partial_path.unlink()
     print(f"Saved {len(ids)} tender IDs → {output_path}")
 
 
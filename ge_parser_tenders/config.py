@@ -14,7 +14,11 @@ class ParserSettings(BaseSettings):
     output: str = "found_tenders.json"
     max_pages: Optional[int] = None          # None → все страницы
     headless: bool = True                    # True = headless Chrome
+    workers: int = 1                         # >1 → страницы в параллельных Chrome
+    scan_workers: int = 2                    # процессы проверки файлов
+    tmp_dir: Optional[str] = None            # None → /dev/shm, если есть
     reset_cache: bool = False
+    clear_cache: bool = False                # удалить .text_cache и scanned_files.sqlite
     log: str = "INFO"
     started_at: datetime | None = None
     model_config = {"extra": "ignore"}
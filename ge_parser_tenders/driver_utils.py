@@ -8,6 +8,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+# шрифты и медиа сетью не тянем вовсе (картинки уже выключены опциями ниже).
+# CSS не блокируем: от него зависят is_displayed()/element_to_be_clickable
+_BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.mp4", "*.webm",
+]
+
 def make_driver(headless: bool = True, download_dir: Path | None = None) -> webdriver.Chrome:
     opts = webdriver.ChromeOptions()
     if headless:
@@ -17,12 +25,17 @@ def make_driver(headless: bool = True, download_dir: Path | None = None) -> webd
         opts.add_argument("--disable-gpu")
     opts.add_argument("--window-size=1920,1080")
     opts.add_argument("--lang=ka,en-US")
+    # картинки парсеру не нужны; ждать window.load тоже незачем —
+    # все дальнейшие шаги ждут нужные элементы через WebDriverWait
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.page_load_strategy = "eager"
 
     prefs = {
         "download.default_directory": str(download_dir or Path.cwd()),
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "safebrowsing.enabled": True,
+        "profile.managed_default_content_settings.images": 2,
     }
     opts.add_experimental_option("prefs", prefs)
 
@@ -31,6 +44,11 @@ def make_driver(headless: bool = True, download_dir: Path | None = None) -> webd
     driver = webdriver.Chrome(options=opts, service=Service("/usr/bin/chromedriver"),  )
     # driver = webdriver.Chrome(service=service, options=opts)
     driver.set_page_load_timeout(60)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+    except WebDriverException:
+        pass                                # без CDP просто грузим всё
     return driver
 
 def wait_click(driver: webdriver.Chrome, locator: tuple[str, str], timeout: int = 20):
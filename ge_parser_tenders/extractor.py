@@ -1,51 +1,264 @@
 """
 Извлечение текста + поиск ключевых слов с подробным логгированием
 ----------------------------------------------------------------
-* поддерживает .pdf / .xls / .xlsx
-* быстрейший порядок: pypdf → pdftotext(poppler) → pandas-excel
+* поддерживает .pdf / .xls / .xlsx / .docx и .zip с ними (рекурсивно);
+  формат определяется по первым байтам файла, а не по расширению
+* быстрейший порядок: PyMuPDF (нет — pypdf) → pdftotext(poppler) → OCR;
+  Excel — pandas; .xlsx/.docx сперва просматриваются как сырой XML из zip
 * fuzzy-поиск (RapidFuzz) + при наличии Stanza — лемматизация
+* извлечённый текст кэшируется в .text_cache/<sha256>.txt — повторный
+  прогон (или новый список ключей) не извлекает документы заново
 """
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterator
+import hashlib
+import html
 import logging
+import os
+import re
 import shlex
+import shutil
+import tempfile
+import zipfile
 from subprocess import run, PIPE
-import re
 import pandas as pd
 
 from .config import ParserSettings       # regex + список
-from .text_matcher import find_keyword_hits            # ← из вашего text_matcher.py
+from . import text_matcher
+from .text_matcher import contains_keywords_fast, find_keyword_hits
 from .ocr_image import extract_pdf_ocr
 
 
+TEXT_CACHE_DIR = Path(".text_cache")
+
+
+class ExtractionFailed(Exception):
+    """Текст не извлечён по временной причине (OCR/poppler недоступны, таймаут)."""
+
 
 # --------------------------------------------------------------------------- #
-#                       helpers: pdf / excel  →  text                         #
+#                    helpers: pdf / excel / docx  →  text                     #
 # --------------------------------------------------------------------------- #
+@lru_cache(maxsize=None)
+def _fitz():
+    """PyMuPDF, импортированный один раз; None, если пакет не установлен."""
+    try:
+        import fitz
+    except ImportError:
+        return None
+    return fitz
+
+
+def _pdf_pages(path: Path) -> Iterator[str]:
+    """Текстовый слой постранично: PyMuPDF (быстрейший), без него — pypdf."""
+    fitz = _fitz()
+    if fitz is None:
+        from pypdf import PdfReader
+        for page in PdfReader(path).pages:
+            yield page.extract_text() or ""
+        return
+    with fitz.open(path) as doc:
+        for page in doc:
+            yield page.get_text("text")
+
+
 def _pdf_to_text_poppler(path: Path) -> str:
     cmd = f"pdftotext -layout -enc UTF-8 {shlex.quote(str(path))} -"
     proc = run(cmd, shell=True, stdout=PIPE, stderr=PIPE, timeout=60)
     return proc.stdout.decode("utf-8", "ignore")
 
 
-def _xlsx_to_text(path: Path) -> str:
-    engine = "openpyxl" if path.suffix == ".xlsx" else "xlrd"
+def _xlsx_to_text(path: Path, kind: str) -> str:
+    engine = "openpyxl" if kind == ".xlsx" else "xlrd"
     df = pd.read_excel(path, dtype=str, header=None, engine=engine)
     return "\n".join(df.fillna("").astype(str).agg("\t".join, axis=1))
 
 
-def extract_text(file_path: Path) -> str:
-    suf = file_path.suffix.lower()
+def _ooxml_parts(path: Path) -> Iterator[str]:
+    """XML-части .docx/.xlsx как есть: грузинский текст лежит в <w:t>/<t> дословно."""
+    with zipfile.ZipFile(path) as z:
+        for name in z.namelist():
+            if name.endswith(".xml"):
+                yield z.read(name).decode("utf-8", "ignore")
+
+
+_STEM_LEN = 3
+
+
+def _ooxml_may_contain(path: Path, keywords: list[str]) -> bool:
+    """
+    Байтовый префильтр .docx/.xlsx: есть ли в распакованном XML хоть одна
+    основа ключа (первые _STEM_LEN букв в UTF-8). Без основы дословного
+    совпадения в сыром XML нет — но Word режет слова на несколько <w:r>,
+    так что False значит лишь «проход по сырому XML бесполезен», а не
+    «ключей в документе нет».
+    """
+    stems = {kw.lower()[:_STEM_LEN].encode("utf-8") for kw in keywords}
+    with zipfile.ZipFile(path) as z:
+        for name in z.namelist():
+            if name.endswith(".xml"):
+                raw = z.read(name).lower()           # bytes.lower — только ASCII
+                if any(stem in raw for stem in stems):
+                    return True
+    return False
+
+
+_W_PARA_END_RX = re.compile(r"</w:p>")
+_W_TAB_RX = re.compile(r"<w:(?:tab|br)\b[^>]*/>")
+_XML_TAG_RX = re.compile(r"<[^>]+>")
+
+
+def _docx_to_text(path: Path) -> str:
+    with zipfile.ZipFile(path) as z:
+        xml = z.read("word/document.xml").decode("utf-8", "ignore")
+    xml = _W_TAB_RX.sub("\t", _W_PARA_END_RX.sub("\n", xml))
+    return html.unescape(_XML_TAG_RX.sub("", xml))
+
+
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# запись каталога OLE (128 байт): имя в UTF-16LE с \0, по смещению 66 — тип
+# (2 — поток). Книга Excel — поток "Workbook" (BIFF8) или "Book" (BIFF5)
+_OLE_WORKBOOK_RX = re.compile(
+    b"(?:" + "Workbook".encode("utf-16-le") + b"|" + "Book".encode("utf-16-le") + b")\x00\x00",
+    re.I,                                   # «WORKBOOK» у старых генераторов
+)
+_OLE_DIR_ENTRY = 128
+
+
+def _magic(head: bytes) -> str:
+    """Грубый формат по первым байтам: ".pdf" / ".zip" / ".ole" или ""."""
+    if head.startswith(_ZIP_MAGIC):         # раньше PDF: в несжатом zip
+        return ".zip"                       # «%PDF-» вложения лежит как есть
+    if head.startswith(_OLE_MAGIC):
+        return ".ole"
+    if _PDF_MAGIC in head:                  # допускается мусор перед %PDF-
+        return ".pdf"
+    return ""
+
+
+def _ole_has_workbook(path: Path) -> bool:
+    """Есть ли в OLE-файле поток книги Excel (.doc/.ppt его не содержат)."""
+    data = path.read_bytes()
+    for m in _OLE_WORKBOOK_RX.finditer(data):
+        pos = m.start()
+        # записи каталога выровнены по 128 байт (сектор кратен 128)
+        if pos % _OLE_DIR_ENTRY == 0 and data[pos + 66:pos + 67] == b"\x02":
+            return True
+    return False
+
+
+def _detect(path: Path) -> str:
+    """
+    Формат по сигнатуре: ".pdf" / ".docx" / ".xlsx" / ".zip" / ".xls" или "".
+    Портал отдаёт файлы с чужими расширениями и как octet-stream, а
+    бинарный мусор без сигнатуры извлекать незачем.
+    """
+    with path.open("rb") as f:
+        kind = _magic(f.read(1024))
+    if kind == ".zip":
+        try:
+            with zipfile.ZipFile(path) as z:
+                names = set(z.namelist())
+        except zipfile.BadZipFile:
+            return ""
+        if "word/document.xml" in names:
+            return ".docx"
+        if "xl/workbook.xml" in names:
+            return ".xlsx"
+    if kind == ".ole":                      # из OLE-форматов умеем только .xls
+        return ".xls" if _ole_has_workbook(path) else ""
+    return kind
+
+
+# пределы для архивов: zip-бомба или архив с видео не должны съесть tmpfs
+_ZIP_MAX_DEPTH = 2                      # архив в архиве — и хватит
+_ZIP_MAX_MEMBER = 50 << 20              # байт распакованного файла
+_ZIP_MAX_TOTAL = 200 << 20              # байт на весь архив
+
+
+def _zip_to_text(path: Path, stop: Callable[[str], bool] | None, depth: int) -> str:
+    """Текст всех поддерживаемых файлов архива; на первом сработавшем *stop* — хватит."""
+    parts: list[str] = []
+    total = 0
+    # распаковываем рядом с архивом — он уже лежит во временной папке
+    # тендера (--tmp-dir), а не в системном /tmp
+    with zipfile.ZipFile(path) as z, tempfile.TemporaryDirectory(dir=path.parent) as tmp:
+        for idx, info in enumerate(z.infolist()):
+            if info.is_dir():
+                continue
+            # ZipExtFile не отдаёт больше заявленного file_size
+            if info.file_size > _ZIP_MAX_MEMBER:
+                logging.debug("    ▸ %s: %d байт — пропускаем", info.filename, info.file_size)
+                continue
+            total += info.file_size
+            if total > _ZIP_MAX_TOTAL:
+                logging.debug("    архив больше %d байт — остальное не смотрим", _ZIP_MAX_TOTAL)
+                break
+            with z.open(info) as src:
+                head = src.read(1024)
+                if not _magic(head):        # картинки, txt и прочее — мимо
+                    continue
+                # имя внутри архива бывает в cp866 и с путями — берём своё
+                # ASCII-имя; формат extract_text определит по сигнатуре
+                member = Path(tmp) / str(idx)
+                with member.open("wb") as dst:
+                    dst.write(head)
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            logging.debug("    ▸ %s", info.filename)
+            parts.append(extract_text(member, stop=stop, depth=depth))
+            member.unlink()
+            if stop and stop(parts[-1]):
+                break
+    return "\n".join(parts)
+
+
+def extract_text(
+    file_path: Path,
+    *,
+    stop: Callable[[str], bool] | None = None,
+    kind: str | None = None,
+    depth: int = 0,
+) -> str:
+    """
+    Текст документа. *stop* — предикат для постраничных путей (PyMuPDF/pypdf,
+    OCR, XML-части .docx/.xlsx): как только кусок его удовлетворяет,
+    возвращается уже прочитанная часть. *kind* — результат `_detect`, если
+    вызывающий его уже знает. *depth* — вложенность архивов, в которых лежит файл.
+    Пустая строка — в файле нет текста или формат не поддерживается;
+    временный сбой (OCR не отработал) поднимает ExtractionFailed.
+    """
+    suf = kind if kind is not None else _detect(file_path)
+    if not suf:
+        logging.debug("    неизвестная сигнатура %s — не извлекаем", file_path.name)
+        return ""
+    if suf in {".docx", ".xlsx"} and stop:           # 0) сырой XML без парсинга
+        try:
+            for part in _ooxml_parts(file_path):
+                if stop(part):
+                    logging.debug("    совпадение в сыром XML — документ не разбираем")
+                    return part
+        except (zipfile.BadZipFile, KeyError) as exc:
+            logging.debug("    zip не прочитан (%s) – пробуем дальше", exc)
+
     if suf == ".pdf":
         text = ""
-        try:                                         # 1) pypdf
-            from pypdf import PdfReader
-            text = "\n".join((p.extract_text() or "") for p in PdfReader(file_path).pages)
+        try:                                         # 1) PyMuPDF / pypdf
+            pages: list[str] = []
+            for page_text in _pdf_pages(file_path):
+                pages.append(page_text)
+                if stop and stop(pages[-1]):
+                    logging.debug("    совпадение на стр. %d — дальше не читаем", len(pages))
+                    return "\n".join(pages)
+            text = "\n".join(pages)
             if len(text.strip()) >= 50:
                 return text
-            logging.debug("    pypdf дал мало текста (%d симв.) – пробуем дальше", len(text))
+            logging.debug("    текстовый слой дал мало текста (%d симв.) – пробуем дальше", len(text))
         except Exception as exc:
-            logging.debug("    pypdf failed (%s) – пробуем дальше", exc)
+            logging.debug("    текстовый слой не прочитан (%s) – пробуем дальше", exc)
         try:                                         # 2)  poppler           
             text = _pdf_to_text_poppler(file_path)
             if len(text.strip()) >= 50:
@@ -54,47 +267,145 @@ def extract_text(file_path: Path) -> str:
         except Exception as exc:
             logging.debug("    poppler failed (%s) – идём в OCR", exc)
         try:                                         # 3)  tesseract-ocr
-            return extract_pdf_ocr(file_path)
+            return extract_pdf_ocr(file_path, stop=stop)
         except Exception as exc:
             logging.warning("%s: OCR failed (%s)", file_path.name, exc)
+            raise ExtractionFailed(f"OCR failed: {exc}") from exc
 
     if suf in {".xls", ".xlsx"}:                     # Excel
         try:
-            return _xlsx_to_text(file_path)
+            return _xlsx_to_text(file_path, suf)
         except Exception as exc:
             logging.warning("%s: excel-extract failed (%s)", file_path.name, exc)
 
+    if suf == ".docx":                               # Word
+        try:
+            return _docx_to_text(file_path)
+        except Exception as exc:
+            logging.warning("%s: docx-extract failed (%s)", file_path.name, exc)
+
+    if suf == ".zip":                                # архив с документами
+        if depth >= _ZIP_MAX_DEPTH:
+            logging.debug("    %s: архив глубже %d уровней — пропускаем",
+                          file_path.name, _ZIP_MAX_DEPTH)
+            return ""
+        try:
+            return _zip_to_text(file_path, stop, depth + 1)
+        except ExtractionFailed:
+            raise
+        except Exception as exc:
+            logging.warning("%s: zip-extract failed (%s)", file_path.name, exc)
+
     return ""
 
 
+# --------------------------------------------------------------------------- #
+#                  on-disk text cache (ключ — sha256 файла)                   #
+# --------------------------------------------------------------------------- #
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cached_text(digest: str) -> str | None:
+    try:
+        return (TEXT_CACHE_DIR / f"{digest}.txt").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _store_text(digest: str, text: str) -> None:
+    """Атомарная запись: параллельные воркеры не увидят недописанный файл."""
+    TEXT_CACHE_DIR.mkdir(exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=TEXT_CACHE_DIR, suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(text)
+    os.replace(tmp.name, TEXT_CACHE_DIR / f"{digest}.txt")
+
+
 # --------------------------------------------------------------------------- #
 #                             public API                                      #
 # --------------------------------------------------------------------------- #
+def init_worker() -> None:
+    """
+    Инициализатор процессов пула проверки: один раз на процесс импортирует
+    PDF-бэкенд и поднимает Stanza, чтобы первый файл не платил за это.
+    """
+    if _fitz() is None:
+        import pypdf  # noqa: F401
+    text_matcher.init_worker()
+
+
 def file_contains_keywords(
     file_path: Path,
     settings: ParserSettings,
     *,
     threshold: int | None = None,
-) -> bool:
+    digest: str | None = None,
+) -> bool | None:
     """
     Возвращает True, если в документе ≥ одно ключевое слово
-    (fuzzy-score ≥ *threshold*).  Пишет подробный лог, повторяя
-    поведение `keyword_tester.py`.
+    (fuzzy-score ≥ *threshold*), False — если ключей нет (в том числе в
+    файле без текста или в формате, который мы не читаем), и None — если
+    текст не извлечён из-за временного сбоя (OCR/poppler) или ключей нет,
+    но Stanza не поднялась и леммы не проверены: такой ответ не окончателен
+    и не кэшируется.
+    Пишет подробный лог, повторяя поведение `keyword_tester.py`.
+    *digest* — sha256 файла, если уже посчитан (scraper хеширует при скачивании).
     """
     logging.info("  Сканируем %s", file_path.name)
 
-    text = extract_text(file_path)
+    digest = digest or _file_sha256(file_path)
+    text = _cached_text(digest)
+    if text is not None:
+        logging.info("  текст взят из кэша (%s…)", digest[:12])
+    else:
+        # постраничное чтение обрывается на первой странице с дословным
+        # совпадением; такой неполный текст в кэш не кладём
+        stopped = False
+
+        def _stop(chunk: str) -> bool:
+            nonlocal stopped
+            stopped = contains_keywords_fast(chunk, settings.keywords_geo)
+            return stopped
+
+        kind = _detect(file_path)
+        if not kind:
+            logging.info("  неизвестный формат — не извлекаем\n")
+            return False
+        stop = _stop
+        if kind in {".docx", ".xlsx"}:
+            try:
+                if not _ooxml_may_contain(file_path, settings.keywords_geo):
+                    # сырой XML смотреть незачем, разбираем документ целиком
+                    logging.debug("  ни одной основы ключа в сыром XML")
+                    stop = None
+            except zipfile.BadZipFile as exc:
+                logging.debug("  zip не прочитан (%s) – извлекаем как есть", exc)
+
+        try:
+            text = extract_text(file_path, stop=stop, kind=kind)
+        except ExtractionFailed as exc:
+            logging.info("  текст не извлечён (%s) — проверим в другой раз\n", exc)
+            return None
+        if text.strip() and not stopped:
+            _store_text(digest, text)
+
     if not text.strip():
-        logging.info("  пустой/не распознан")
+        logging.info("  пустой/не распознан\n")
         return False
     logging.info("  Извлечено %d символов", len(text))
     logging.info("  Начинаем поиск ключевых слов…")
 
-    # ── быстрый префильтр regex ― резко сокращает количество fuzzy-сравнений
-    if not re.compile("|".join(map(re.escape, settings.keywords_geo)), flags=re.I).search(text):
-        logging.debug("  regex промахнулся — переходим к fuzzy + леммам")
-    else:
-        logging.debug(" regex совпал — уточняем fuzzy-скор")
+    # ── быстрый путь: дословное совпадение находится одним regex, Stanza не нужна
+    if contains_keywords_fast(text, settings.keywords_geo):
+        logging.info(" Ключевое слово найдено строгим regex\n")
+        return True
+    logging.debug("  regex промахнулся — переходим к fuzzy + леммам")
 
     # ── fuzzy-поиск ключевых слов
     thresh = threshold or settings.fuzzy_threshold
@@ -106,4 +417,7 @@ def file_contains_keywords(
         for kw, score in sorted(hits.items(), key=lambda t: -t[1]):
             logging.debug("        %-60s  score=%d", kw, score)
 
+    if not hits and not text_matcher.lemmas_available():
+        logging.info("  леммы не проверены (Stanza недоступна) — вердикт не запоминаем")
+        return None
     return bool(hits)
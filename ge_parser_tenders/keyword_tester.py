@@ -34,7 +34,7 @@ import stanza
 
 from .config import ParserSettings
 settings = ParserSettings.load()
-from .extractor import extract_text  # type: ignore  # noqa: E402
+from .extractor import ExtractionFailed, extract_text  # type: ignore  # noqa: E402
      # type: ignore  # noqa: E402
 
 # ---------------------------------------------------------------------------
@@ -92,7 +92,11 @@ def main(argv: list[str] | None = None) -> None:
                         format="%(levelname)s: %(message)s")
 
     logging.info("Scanning %s", args.file)
-    text = extract_text(args.file)
+    try:
+        text = extract_text(args.file)
+    except ExtractionFailed as exc:
+        logging.error("Extraction failed (%s) — aborting.", exc)
+        sys.exit(2)
     if not text.strip():
         logging.error("No text extracted — aborting.")
         sys.exit(2)
@@ -1,6 +1,7 @@
 # ge_parser_tenders/ocr_image.py
 from __future__ import annotations
 from pathlib import Path
+from typing import Callable
 import logging
 import tempfile
 
@@ -16,10 +17,13 @@ def _ocr_image(img: Image.Image, lang: str = "ka+eng") -> str:
     # Tesseract 5: download traineddata 'ka' once: `tesseract --list-langs`
     return pytesseract.image_to_string(img, lang=lang, config="--psm 6")
 
-def extract_pdf_ocr(pdf_path: Path, *, dpi: int = 300) -> str:
+def extract_pdf_ocr(
+    pdf_path: Path, *, dpi: int = 300, stop: Callable[[str], bool] | None = None
+) -> str:
     """
     Конвертирует страницы в PNG → скармливает Tesseract.
-    Возвращает concatenated-текст всего файла.
+    Возвращает concatenated-текст всего файла, либо текст до первой
+    страницы, на которой сработал *stop*.
     """
     logging.info("    🖼  OCR-экстракция (pdf2image, %d dpi)…", dpi)
     text_parts: list[str] = []
@@ -32,4 +36,7 @@ def extract_pdf_ocr(pdf_path: Path, *, dpi: int = 300) -> str:
             logging.debug("        ▸ страница %02d", idx)
             ocr = _ocr_image(img)
             text_parts.append(ocr)
+            if stop and stop(ocr):
+                logging.debug("        совпадение — остальные страницы не распознаём")
+                break
     return "\n".join(text_parts)
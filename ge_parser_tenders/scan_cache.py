@@ -0,0 +1,91 @@
+# ge_parser_tenders/scan_cache.py
+"""
+Результаты проверки вложений между прогонами
+--------------------------------------------
+* ключ — sha256 содержимого файла + отпечаток настроек поиска (ключевые
+  слова и порог), поэтому после смены списка ключей старые ответы не всплывут
+* URL → sha256: повторно встреченное вложение не нужно даже скачивать.
+  Запись живёт URL_TTL и хранит валидатор ответа (ETag / Last-Modified /
+  длину), который scraper сверяет HEAD-запросом
+* SQLite в режиме WAL: процессы `--workers` пишут одновременно
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from .config import ParserSettings
+
+__all__ = ["SCAN_CACHE_PATH", "config_key", "lookup", "store", "url_digest", "store_url"]
+
+SCAN_CACHE_PATH = Path("scanned_files.sqlite")
+URL_TTL = 7 * 24 * 3600                         # сек.; потом URL скачивается заново
+
+_CONN: sqlite3.Connection | None = None
+_CONN_PID = 0                                   # соединение не переживает fork
+
+
+def _conn() -> sqlite3.Connection:
+    global _CONN, _CONN_PID
+    if _CONN is None or _CONN_PID != os.getpid():
+        _CONN = sqlite3.connect(SCAN_CACHE_PATH, timeout=30)
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute(
+            "CREATE TABLE IF NOT EXISTS scanned ("
+            " sha TEXT NOT NULL, config TEXT NOT NULL, hit INTEGER NOT NULL,"
+            " PRIMARY KEY (sha, config))"
+        )
+        _CONN.execute(
+            "CREATE TABLE IF NOT EXISTS url_map ("
+            " url TEXT PRIMARY KEY, sha TEXT NOT NULL,"
+            " validator TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        _CONN_PID = os.getpid()
+    return _CONN
+
+
+def config_key(settings: ParserSettings) -> str:
+    """Отпечаток того, что влияет на ответ: ключевые слова и fuzzy-порог."""
+    blob = json.dumps(
+        [sorted(settings.keywords_geo), settings.fuzzy_threshold], ensure_ascii=False
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def lookup(sha: str, config: str) -> bool | None:
+    """Сохранённый результат или None, если файл с такими настройками не проверялся."""
+    row = _conn().execute(
+        "SELECT hit FROM scanned WHERE sha = ? AND config = ?", (sha, config)
+    ).fetchone()
+    return None if row is None else bool(row[0])
+
+
+def store(sha: str, config: str, hit: bool) -> None:
+    with _conn() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO scanned (sha, config, hit) VALUES (?, ?, ?)",
+            (sha, config, int(hit)),
+        )
+
+
+def url_digest(url: str) -> tuple[str, str] | None:
+    """(sha256, валидатор) для *url* из прошлых прогонов или None, если записи нет / устарела."""
+    row = _conn().execute(
+        "SELECT sha, validator FROM url_map WHERE url = ? AND stored_at > ?",
+        (url, time.time() - URL_TTL),
+    ).fetchone()
+    return None if row is None else (row[0], row[1])
+
+
+def store_url(url: str, sha: str, validator: str) -> None:
+    """Вызывать только для URL, чей файл проверен окончательно (есть в scanned)."""
+    with _conn() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO url_map (url, sha, validator, stored_at) VALUES (?, ?, ?, ?)",
+            (url, sha, validator, time.time()),
+        )
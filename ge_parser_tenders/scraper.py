@@ -19,17 +19,28 @@ scraper.py ― грузинские тендеры
   отключена.
 """
 
+import hashlib
+import io
 import logging
 import mimetypes
+import multiprocessing
+import os
 import re
 import shutil
 import tempfile
 import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+)
+from functools import partial
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, List, Set, TextIO
 from urllib.parse import unquote, urlparse
 
-import requests
+import httpx
 from selenium.common.exceptions import (
     ElementNotInteractableException,
     StaleElementReferenceException,
@@ -44,10 +55,11 @@ from slugify import slugify
 from tqdm import tqdm
 
 
+from . import scan_cache
 from .config import ParserSettings
 
 from .driver_utils import make_driver, wait_click
-from .extractor import file_contains_keywords
+from .extractor import file_contains_keywords, init_worker
 
 # ---------------------------------------------------------------------------
 #   Фильтр компаний, которых следует исключать
@@ -97,6 +109,15 @@ def _filename_from_cd(cd: str | None) -> str | None:
     return None
 
 
+_FILE_PARAM_RX = re.compile(r"[?&]file=([^&#]+)")
+
+
+def _file_param(href: str) -> str:
+    """Имя файла из параметра ?file=… ссылки (URL‑декодированное) или ""."""
+    m = _FILE_PARAM_RX.search(href)
+    return unquote(m[1]) if m else ""
+
+
 _CT_EXT_MAP = {
     "application/pdf": ".pdf",
     "application/msword": ".doc",
@@ -137,6 +158,133 @@ def _unique(path: Path) -> Path:
         idx += 1
 
 
+# ── дедупликация вложений в пределах прогона ───────────────────────────
+#   одни и те же приложения повторяются у разных тендеров: URL → sha256
+#   содержимого, sha256 → результат проверки ключевых слов (между прогонами
+#   оба соответствия хранит scan_cache)
+
+_DOWNLOAD_CHUNK = 1 << 20                # 1 MiB: меньше write()/hash.update() на файл
+
+_URL_DIGESTS: dict[str, str] = {}
+_SCAN_RESULTS: dict[str, bool] = {}
+
+# проверка в пуле → (sha256 файла, URL, валидатор ответа)
+_Pending = dict[Future, tuple[str, str, str]]
+
+
+def _validator(headers: httpx.Headers) -> str:
+    """Чем сервер подтверждает неизменность файла: ETag, Last-Modified или длина."""
+    if "ETag" in headers:
+        return headers["ETag"]
+    if "Last-Modified" in headers:
+        return headers["Last-Modified"]
+    if "Content-Length" in headers and "Content-Encoding" not in headers:
+        return f"len:{headers['Content-Length']}"
+    return ""
+
+
+def _remembered_digest(client: httpx.Client, url: str) -> str | None:
+    """
+    sha256 файла за *url* из прошлых прогонов — если запись не устарела и
+    HEAD‑ответ сервера совпадает с сохранённым валидатором.
+    """
+    known = scan_cache.url_digest(url)
+    if known is None:
+        return None
+    sha, validator = known
+    if validator:
+        try:
+            resp = client.head(url)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            return None
+        if _validator(resp.headers) != validator:
+            return None
+    return sha
+
+
+def _download(
+    client: httpx.Client, url: str, dest_dir: Path, fallback_name: str
+) -> tuple[Path, str, str]:
+    """
+    Скачивает *url* в *dest_dir* под безопасным ASCII‑именем.
+    Возвращает путь, sha256 содержимого, посчитанный на лету, и валидатор
+    ответа (см. _validator).
+    """
+    digest = hashlib.sha256()
+    with client.stream("GET", url) as resp:
+        resp.raise_for_status()
+        name = _filename_from_cd(resp.headers.get("Content-Disposition")) or fallback_name
+        if "." not in Path(name).name:
+            name += _ext_from_content_type(resp.headers.get("Content-Type"))
+
+        out_path = _unique(dest_dir / _safe_filename(name))
+        with out_path.open("wb") as f:
+            # размер известен заранее → отдаём его ФС одним fallocate
+            # (Content-Length при gzip/deflate — это размер сжатого тела)
+            total = int(resp.headers.get("Content-Length") or 0)
+            if total > 0 and "Content-Encoding" not in resp.headers \
+                    and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, total)
+                except OSError:
+                    pass                        # ФС без поддержки — пишем как обычно
+            for chunk in resp.iter_bytes(_DOWNLOAD_CHUNK):
+                digest.update(chunk)
+                f.write(chunk)
+            f.truncate()                        # сервер мог прислать меньше, чем обещал
+        validator = _validator(resp.headers)
+    return out_path, digest.hexdigest(), validator
+
+
+def _init_scan_worker(log_level: int) -> None:
+    """spawn‑процесс не наследует настройки logging родителя."""
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+    init_worker()
+
+
+def _known_result(digest: str | None, config: str) -> bool | None:
+    """Результат проверки файла: из памяти прогона, иначе из scan_cache."""
+    if digest is None:
+        return None
+    if digest not in _SCAN_RESULTS:
+        known = scan_cache.lookup(digest, config)
+        if known is None:
+            return None
+        _SCAN_RESULTS[digest] = known
+    return _SCAN_RESULTS[digest]
+
+
+def _drain(pending: _Pending, config: str, *, block: bool) -> bool:
+    """
+    Переносит окончательные результаты проверок из пула в _SCAN_RESULTS и
+    scan_cache (с отпечатком настроек *config*, вместе с URL → sha256) и
+    убирает их из *pending*; файл, из которого не удалось извлечь текст,
+    считается «без совпадения», но нигде не запоминается.
+    block=False — только уже готовые; block=True — ждёт по мере готовности
+    и останавливается на первом совпадении. True — совпадение есть.
+    """
+    found = False
+    ready = as_completed(list(pending)) if block else [f for f in list(pending) if f.done()]
+    for fut in ready:
+        digest, url, validator = pending.pop(fut)
+        try:
+            result = fut.result()
+        except Exception as exc:
+            logging.warning("   Файл не проверен (%s)", exc)
+            continue
+        if result is None:
+            continue        # текст не извлечён — не запоминаем, в другой раз повторим
+        _SCAN_RESULTS[digest] = result
+        scan_cache.store(digest, config, result)
+        scan_cache.store_url(url, digest, validator)
+        if result:
+            found = True
+            if block:
+                break
+    return found
+
+
 # ── пагинация ──────────────────────────────────────────────────────────
 
 def _has_next_page(driver) -> bool:
@@ -175,6 +323,34 @@ def _next_page(driver, timeout: int = 30):
     )
 
 
+_ROW_IDS_JS = """
+return Array.from(
+    document.querySelectorAll('#list_apps_by_subject tbody tr'),
+    tr => { const s = tr.querySelector('p strong'); return s ? s.textContent.trim() : ''; }
+);
+"""
+
+_ROW_BY_ID_JS = """
+return Array.from(document.querySelectorAll('#list_apps_by_subject tbody tr')).find(tr => {
+    const s = tr.querySelector('p strong'); return s && s.textContent.trim() === arguments[0];
+}) || null;
+"""
+
+_CANDIDATES_JS = """
+return Array.from(
+    document.querySelectorAll('#app_bids table.ktable tbody tr td:nth-child(1)'),
+    td => td.textContent.trim()
+).filter(Boolean);
+"""
+
+_ATTACHMENTS_JS = """
+return Array.from(
+    document.querySelectorAll('div.answ-file a'),
+    a => [a.href, a.textContent.trim()]
+).filter(l => l[0]);
+"""
+
+
 # ── безопасный клик по строке ──────────────────────────────────────────
 
 def safe_click(driver, element, retries: int = 3):
@@ -194,156 +370,380 @@ def safe_click(driver, element, retries: int = 3):
 #                               main scraper
 # ---------------------------------------------------------------------------
 
-def scrape_tenders(max_pages: int | None = None, *, headless: bool = True, settings: ParserSettings,) -> List[str]:
-    """Возвращает список ID тендеров, в чьих документах найдены ключевые слова."""
+def _open_search(driver, settings: ParserSettings) -> httpx.Client:
+    """Открывает портал, ставит фильтр и возвращает HTTP‑клиент с cookie браузера."""
+    driver.get(str(settings.start_url))               # ← cast to str
+
+    # скопируем cookie в общий HTTP/2‑клиент → экономим авторизацию,
+    # все вложения идут по одному keep‑alive соединению
+    client = httpx.Client(
+        http2=True,
+        cookies={c["name"]: c["value"] for c in driver.get_cookies()},
+        limits=httpx.Limits(max_keepalive_connections=20),
+        follow_redirects=True,
+        timeout=60,
+    )
 
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    # фильтр «გამარჯვებული გამოვლენილია» (победитель определён)
+    # вместо фиксированных пауз ждём нужного состояния DOM: wait_click сам
+    # дожидается кликабельной опции, затем — что она действительно выбрана
+    winner_option = (By.XPATH, "//option[contains(., 'გამარჯვებული გამოვლენილია')]")
+    wait_click(driver, (By.ID, "app_donor_id"))
+    wait_click(driver, winner_option)
+    WebDriverWait(driver, 10).until(EC.element_located_to_be_selected(winner_option))
+    wait_click(driver, (By.ID, "search_btn"))
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "#list_apps_by_subject tbody tr"))
+    )
+    return client
+
+
+def _scrape_page(
+    driver,
+    client: httpx.Client,
+    page: int,
+    *,
+    scan_pool: Executor,
+    settings: ParserSettings,
+    visited: Set[str],
+    visited_log: TextIO,
+    downloads_dir: Path,
+    on_hit: Callable[[str], None] | None = None,
+) -> List[str]:
+    """
+    Обходит тендеры текущей страницы результатов, возвращает ID с совпадениями.
+    *on_hit* вызывается для каждого такого ID сразу, как только он найден.
+    """
+    root = "{uri.scheme}://{uri.netloc}".format(uri=urlparse(str(settings.start_url)))
+    config = scan_cache.config_key(settings)
+    hits: List[str] = []
 
-    DOWNLOADS_DIR = Path("downloads")
-    if DOWNLOADS_DIR.exists():
-        shutil.rmtree(DOWNLOADS_DIR)
-    DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    # ID всех строк страницы — одним RPC вместо find_element на каждую строку
+    tender_ids: list[str] = driver.execute_script(_ROW_IDS_JS)
 
-    cache_path = Path("visited_ids.txt")
-    visited: Set[str] = set(cache_path.read_text().split()) if cache_path.exists() else set()
-    hits: List[str] = []
+    for tender_id in tqdm(tender_ids, desc=f"Page {page}", unit="tender"):
+        if not tender_id or tender_id in visited:
+            continue
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        driver = make_driver(headless=headless, download_dir=Path(tmpdir))
-        driver.get(str(settings.start_url))               # ← cast to str
+        # WebElement нужен только для клика; после «назад» таблица
+        # перестроена, поэтому берём заново — одну строку именно с этим ID
+        # (выдача может сдвинуться во время прогона, индекс ненадёжен)
+        tender_row: WebElement | None = driver.execute_script(_ROW_BY_ID_JS, tender_id)
+        if tender_row is None:
+            logging.info("  Тендер %s пропал со страницы — пропускаем", tender_id)
+            continue
 
-        root = "{uri.scheme}://{uri.netloc}".format(uri=urlparse(str(settings.start_url)))
+        safe_click(driver, tender_row)
+        # ―――――― Проверка кандидатов на вкладке «შეთავაზებები» ―――――――
+        try:
+            wait_click(driver, (By.XPATH, "//a[contains(., 'შეთავაზებები')]"))
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located(
+                    (By.CSS_SELECTOR, "#app_bids table.ktable tbody tr")
+                )
+            )
+            # названия всех кандидатов — одним RPC вместо двух .text на ячейку
+            candidates: list[str] = driver.execute_script(_CANDIDATES_JS)
+            firm_found = any(settings.excluded_firm in c for c in candidates)
+            logging.info(
+                "   Найденные кандидаты: %s. Кандидата შპს ,,ინგი-77 %s",
+                ", ".join(candidates) or "—",
+                "найден" if firm_found else "не найдено",
+            )
+            if firm_found:
+                # назад и пропускаем тендер
+                visited.add(tender_id)
+                visited_log.write(tender_id + "\n")
+                wait_click(driver, (By.ID, "back_button_2"))
+                WebDriverWait(driver, 30).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, "#list_apps_by_subject tbody tr")
+                    )
+                )
+                continue
+        except Exception as exc:
+            logging.warning("Не удалось получить список кандидатов (%s) – продолжаем", exc)
 
-        # скопируем cookie в requests.Session → экономим авторизацию
-        session = requests.Session()
-        for c in driver.get_cookies():
-            session.cookies.set(c["name"], c["value"])
+        # «დოკუმენტაცია»
+        WebDriverWait(driver, 30).until(
+            EC.element_to_be_clickable((By.XPATH, "//a[contains(., 'დოკუმენტაცია')]"))
+        )
+        wait_click(driver, (By.XPATH, "//a[contains(., 'დოკუმენტაცია')]"))
 
-        # фильтр «გამარჯვებული გამოვლენილია» (победитель определён)
-        wait_click(driver, (By.ID, "app_donor_id"))
-        time.sleep(2)
-        wait_click(driver, (By.XPATH, "//option[contains(., 'გამარჯვებული გამოვლენილია')]"))
-        time.sleep(1)
-        wait_click(driver, (By.ID, "search_btn"))
         WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "#list_apps_by_subject tbody tr"))
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.answ-file a"))
         )
+        # (href, текст) всех вложений — одним RPC вместо get_attribute/.text на ссылку
+        links: list[list[str]] = driver.execute_script(_ATTACHMENTS_JS)
+        logging.info("  Найдено %d вложений", len(links))
+
+        # у каждого тендера своя папка с уникальным именем: проверка, которую
+        # не удалось отменить, дочитывает свой файл (или падает на удалённом),
+        # но никогда не получит под тем же путём файл следующего тендера
+        tender_dir = Path(tempfile.mkdtemp(prefix="tender_", dir=downloads_dir))
+
+        # скачивание следующего файла идёт, пока пул проверяет предыдущие
+        found = False
+        pending: _Pending = {}
+        for href, link_text in links:
+            if _drain(pending, config, block=False):
+                found = True
+                break
 
-        page = 1
-        while True:
-            logging.info("Page %d", page)
-            rows = driver.find_elements(By.CSS_SELECTOR, "#list_apps_by_subject tbody tr")
+            url = href if href.startswith("http") else f"{root}/{href.lstrip('/')}"
 
-            for idx in tqdm(range(len(rows)), desc=f"Page {page}", unit="tender"):
-                rows = driver.find_elements(By.CSS_SELECTOR, "#list_apps_by_subject tbody tr")
-                if idx >= len(rows):
-                    break
+            display_name = link_text or _file_param(href) or Path(urlparse(url).path).name
 
-                tender_row = rows[idx]
-                tender_id = tender_row.find_element(By.CSS_SELECTOR, "p strong").text.strip()
-                if tender_id in visited:
-                    continue
-                visited.add(tender_id)
+            logging.info("  Скачиваем %s …", display_name)
 
-                safe_click(driver, tender_row)
-                # ―――――― Проверка кандидатов на вкладке «შეთავაზებები» ―――――――
+            # URL уже встречался (в этом или прошлом прогоне) и файл за ним
+            # проверен — не скачиваем вовсе
+            digest = _URL_DIGESTS.get(url) or _remembered_digest(client, url)
+            if _known_result(digest, config) is not None:
+                logging.info("   URL уже проверен — не скачиваем")
+            else:
                 try:
-                    wait_click(driver, (By.XPATH, "//a[contains(., 'შეთავაზებები')]"))
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_all_elements_located(
-                            (By.CSS_SELECTOR, "#app_bids table.ktable tbody tr")
-                        )
-                    )
-                    cand_cells: list[WebElement] = driver.find_elements(
-                        By.CSS_SELECTOR,
-                        "#app_bids table.ktable tbody tr td:nth-child(1)",
-                    )
-                    candidates: list[str] = [c.text.strip() for c in cand_cells if c.text.strip()]
-                    firm_found = any(settings.excluded_firm in c for c in candidates)
-                    logging.info(
-                        "   Найденные кандидаты: %s. Кандидата შპს ,,ინგი-77 %s",
-                        ", ".join(candidates) or "—",
-                        "найден" if firm_found else "не найдено",
+                    out_path, digest, validator = _download(
+                        client, url, tender_dir, display_name
                     )
-                    if firm_found:
-                        # назад и пропускаем тендер
-                        wait_click(driver, (By.ID, "back_button_2"))
-                        WebDriverWait(driver, 30).until(
-                            EC.presence_of_element_located(
-                                (By.CSS_SELECTOR, "#list_apps_by_subject tbody tr")
-                            )
-                        )
-                        continue
                 except Exception as exc:
-                    logging.warning("Не удалось получить список кандидатов (%s) – продолжаем", exc)
+                    logging.warning("   Не скачан %s (%s)", url, exc)
+                    continue
+                _URL_DIGESTS[url] = digest
+
+                if any(d == digest for d, _, _ in pending.values()):
+                    continue                        # тот же файл уже в очереди
+                if _known_result(digest, config) is not None:
+                    logging.info("   Такой файл уже проверен (sha256 %s…)", digest[:12])
+                    scan_cache.store_url(url, digest, validator)
+                else:
+                    fut = scan_pool.submit(
+                        file_contains_keywords, out_path, settings=settings, digest=digest
+                    )
+                    pending[fut] = (digest, url, validator)
+                    continue
 
-                # «დოკუმენტაცია»
-                WebDriverWait(driver, 30).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[contains(., 'დოკუმენტაცია')]"))
-                )
-                wait_click(driver, (By.XPATH, "//a[contains(., 'დოკუმენტაცია')]"))
+            if _SCAN_RESULTS[digest]:
+                # если нашли хотя бы 1 файл — остальные можно не смотреть
+                found = True
+                break
+
+        # ждём проверки до первого совпадения, ещё не начатые после него
+        # отменяем; уже идущие досчитаются вхолостую (результат не нужен)
+        if not found:
+            found = _drain(pending, config, block=True)
+        for fut in pending:
+            fut.cancel()
+        if found:
+            hits.append(tender_id)
+            if on_hit:
+                on_hit(tender_id)
+
+        # очистка временных файлов перед следующим тендером
+        shutil.rmtree(tender_dir, ignore_errors=True)
+
+        # в журнал — только полностью обработанный тендер (совпадение к этому
+        # моменту уже отдано on_hit): упавший посреди тендера прогон при
+        # повторном запуске обработает его заново
+        visited.add(tender_id)
+        visited_log.write(tender_id + "\n")
+
+        # назад к списку
+        wait_click(driver, (By.ID, "back_button_2"))
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#list_apps_by_subject tbody tr"))
+        )
+
+    return hits
 
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.answ-file a"))
+
+def _make_scan_pool(scan_workers: int) -> ProcessPoolExecutor:
+    """Пул проверки файлов: spawn — у каждого процесса своя Stanza, без копии Chrome."""
+    return ProcessPoolExecutor(
+        max_workers=scan_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_scan_worker,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    )
+
+
+def _scrape_page_worker(
+    page: int,
+    *,
+    headless: bool,
+    settings: ParserSettings,
+    visited: frozenset[str],
+    tmp_dir: str | None,
+    scan_workers: int,
+) -> tuple[List[str], List[str]] | None:
+    """
+    Задача пула процессов: свой Chrome → фильтр → «Next» до страницы *page*.
+    Возвращает (ID с совпадениями, ID обработанных тендеров) или None, если
+    такой страницы нет. Журнал visited пишет родитель — уже после того, как
+    отдал совпадения в on_hit.
+    """
+    visited_log = io.StringIO()
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmpdir:
+        downloads_dir = Path(tmpdir)
+        driver = make_driver(headless=headless, download_dir=downloads_dir)
+        try:
+            with _open_search(driver, settings) as client, \
+                    _make_scan_pool(scan_workers) as scan_pool:
+                try:
+                    for _ in range(page - 1):
+                        _next_page(driver)
+                except (TimeoutException, StopIteration):
+                    return None
+                logging.info("Page %d", page)
+                page_hits = _scrape_page(
+                    driver, client, page,
+                    scan_pool=scan_pool,
+                    settings=settings,
+                    visited=set(visited),
+                    visited_log=visited_log,
+                    downloads_dir=downloads_dir,
                 )
-                links = driver.find_elements(By.CSS_SELECTOR, "div.answ-file a")
-                logging.info("  Найдено %d вложений", len(links))
-
-                for link in links:
-                    href = link.get_attribute("href")
-                    url = href if href.startswith("http") else f"{root}/{href.lstrip('/')}"
-
-                    display_name = (link.text.strip()
-                                    or href.split("file=")[-1]
-                                    or Path(url).name)
-                    
-                    logging.info("  Скачиваем %s …", display_name)
-
-                    try:
-                        resp = session.get(url, stream=True, timeout=60)
-                        resp.raise_for_status()
-                    except Exception as exc:
-                        logging.warning("   Не скачан %s (%s)", url, exc)
-                        continue
-
-                    cd_name = _filename_from_cd(resp.headers.get("Content-Disposition"))
-                    name = cd_name or link.text.strip() or href.split("file=")[-1]
-                    if "." not in Path(name).name:
-                        name += _ext_from_content_type(resp.headers.get("Content-Type"))
-
-                    out_path = _unique(DOWNLOADS_DIR / _safe_filename(name))
-
-                    with out_path.open("wb") as f:
-                        for chunk in resp.iter_content(8192):
-                            f.write(chunk)
-
-                    if file_contains_keywords(out_path, settings=settings):
-                        hits.append(tender_id)
-                        # если нашли хотя бы 1 файл — остальные можно не смотреть
-                        break
-
-                # очистка временных файлов перед следующим тендером
-                shutil.rmtree(DOWNLOADS_DIR)
-                DOWNLOADS_DIR.mkdir(exist_ok=True)
-
-                # назад к списку
-                wait_click(driver, (By.ID, "back_button_2"))
-                WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "#list_apps_by_subject tbody tr"))
+                return page_hits, visited_log.getvalue().split()
+        finally:
+            driver.quit()
+
+
+def _scrape_parallel(
+    max_pages: int | None,
+    workers: int,
+    *,
+    headless: bool,
+    settings: ParserSettings,
+    visited: Set[str],
+    cache_path: Path,
+    tmp_dir: str | None,
+    scan_workers: int,
+    on_hit: Callable[[str], None] | None,
+) -> List[str]:
+    """
+    Страницы независимы — раздаём их пачками по *workers* процессам; у
+    каждого свой пул проверки на *scan_workers* процессов (процессы
+    ProcessPoolExecutor не демонические и могут его породить).
+    Журнал *cache_path* пишет только этот (родительский) процесс: ID
+    страницы попадают в него после того, как её совпадения ушли в *on_hit*.
+    """
+    job = partial(
+        _scrape_page_worker,
+        headless=headless,
+        settings=settings,
+        visited=frozenset(visited),
+        tmp_dir=tmp_dir,
+        scan_workers=scan_workers,
+    )
+    hits: List[str] = []
+    first = 1
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            cache_path.open("a", buffering=1) as visited_log:
+        while max_pages is None or first <= max_pages:
+            last = first + workers - 1
+            if max_pages:
+                last = min(last, max_pages)
+            results = []
+            for result in pool.map(job, range(first, last + 1)):
+                results.append(result)
+                if result is None:
+                    continue
+                page_hits, done_ids = result
+                for tid in page_hits:
+                    hits.append(tid)
+                    if on_hit:
+                        on_hit(tid)
+                visited_log.writelines(f"{tid}\n" for tid in done_ids)
+                os.fsync(visited_log.fileno())
+            if any(result is None for result in results):
+                break                                   # дошли до конца выдачи
+            first = last + 1
+    return hits
+
+
+def scrape_tenders(
+    max_pages: int | None = None,
+    *,
+    headless: bool = True,
+    workers: int = 1,
+    scan_workers: int = 2,
+    tmp_dir: str | None = None,
+    on_hit: Callable[[str], None] | None = None,
+    settings: ParserSettings,
+) -> List[str]:
+    """
+    Возвращает список ID тендеров, в чьих документах найдены ключевые слова.
+
+    *workers* > 1 обрабатывает страницы параллельно: у каждого процесса
+    свой Chrome, который заново ставит фильтр и листает до своей страницы.
+    *scan_workers* — процессы, проверяющие скачанные файлы (каждый со своей
+    Stanza) параллельно со скачиванием следующих; при *workers* > 1 — на
+    каждый процесс страниц.
+    *tmp_dir* — где создавать временную папку для вложений (None — системная).
+    *on_hit* получает каждый найденный ID сразу, не дожидаясь конца прогона.
+    """
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    cache_path = Path("visited_ids.txt")
+    cached = cache_path.read_text() if cache_path.exists() else ""
+    logged = cached.split()
+    visited: Set[str] = set(logged)
+    # журнал только дописывается: параллельные воркеры могут обработать один
+    # тендер дважды (выдача сдвигается во время прогона), старый формат — без
+    # \n в конце. Сжимаем его атомарно, сохраняя порядок.
+    if len(logged) != len(visited) or (cached and not cached.endswith("\n")):
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text("".join(f"{tid}\n" for tid in dict.fromkeys(logged)))
+        os.replace(tmp_path, cache_path)
+
+    if workers > 1:
+        return _scrape_parallel(
+            max_pages, workers,
+            headless=headless, settings=settings, visited=visited,
+            cache_path=cache_path, tmp_dir=tmp_dir,
+            scan_workers=scan_workers, on_hit=on_hit,
+        )
+
+    hits: List[str] = []
+
+    scan_pool = _make_scan_pool(scan_workers)
+
+    # append-only журнал: прогресс переживает падение посреди прогона
+    with scan_pool, cache_path.open("a", buffering=1) as visited_log, \
+            tempfile.TemporaryDirectory(dir=tmp_dir) as tmpdir:
+        # одна временная папка и для браузера, и для скачанных вложений
+        downloads_dir = Path(tmpdir)
+        driver = make_driver(headless=headless, download_dir=downloads_dir)
+
+        with _open_search(driver, settings) as client:
+            page = 1
+            while True:
+                logging.info("Page %d", page)
+                hits += _scrape_page(
+                    driver, client, page,
+                    scan_pool=scan_pool,
+                    settings=settings,
+                    visited=visited,
+                    visited_log=visited_log,
+                    downloads_dir=downloads_dir,
+                    on_hit=on_hit,
                 )
+                # построчная буферизация отдаёт ID ядру сразу, а на диск
+                # журнал сбрасываем раз в страницу — переживёт и сбой питания
+                os.fsync(visited_log.fileno())
 
-            # --- переход на следующую страницу --------------------------------
-            if max_pages and page >= max_pages:
-                break
-            try:
-                _next_page(driver)
-                page += 1
-            except (TimeoutException, StopIteration):
-                break
+                # --- переход на следующую страницу ----------------------------
+                if max_pages and page >= max_pages:
+                    break
+                try:
+                    _next_page(driver)
+                    page += 1
+                except (TimeoutException, StopIteration):
+                    break
 
         driver.quit()
 
-    cache_path.write_text("\n".join(sorted(visited)))
     return hits
 
 
@@ -3,73 +3,184 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
 from rapidfuzz import fuzz
 import stanza
 
+from .text_utils import normalize as _norm
+
+try:
+    import ahocorasick                           # pyahocorasick — необязателен
+except ImportError:
+    ahocorasick = None
+
 GE_RANGE = "ა-ჰ"                        # груз. алфавит mkhedruli
 
-__all__ = ["contains_keywords", "find_keyword_hits"]
+__all__ = [
+    "contains_keywords", "contains_keywords_fast", "find_keyword_hits",
+    "init_worker", "lemmas_available",
+]
 
 # ────────────────── Stanza init ──────────────────
-try:
-    _NLP = stanza.Pipeline(
-        "ka",
-        processors="tokenize,pos,lemma",
-        tokenize_no_ssplit=True,
-        use_gpu=False,
-        logging_level="WARN",
-    )
-except Exception as exc:
-    logging.warning("Stanza disabled: %s", exc)
-    _NLP = None
+#   Пайплайн поднимается лениво: в основном процессе — при первой
+#   лемматизации, в процессах пула проверки — инициализатором, один раз
+#   на процесс. Параллельность даёт сам пул проверки файлов (scraper).
+_NLP: stanza.Pipeline | None = None
+_NLP_READY = False
+
+_LEMMA_CHUNK = 20_000                              # символов на один вызов Stanza
+
+
+def _load_nlp() -> None:
+    global _NLP, _NLP_READY
+    if _NLP_READY:
+        return
+    _NLP_READY = True
+    try:
+        _NLP = stanza.Pipeline(
+            "ka",
+            processors="tokenize,pos,lemma",
+            tokenize_no_ssplit=True,
+            use_gpu=False,
+            logging_level="WARN",
+        )
+    except Exception as exc:
+        logging.warning("Stanza disabled: %s", exc)
+        _NLP = None
+
+
+def init_worker() -> None:
+    """Инициализатор процессов пула: прогревает Stanza до первого файла."""
+    _load_nlp()
+
+
+def lemmas_available() -> bool:
+    """Поднялась ли Stanza: без неё поиск по леммам молча пропускается."""
+    _load_nlp()
+    return _NLP is not None
 
 
 # ────────────────── helpers ──────────────────
-def _lemma(text: str) -> str:
+def _lemma_one(text: str) -> str:
+    _load_nlp()
     if _NLP is None:
         return ""
     doc = _NLP(text)
     return " ".join(w.lemma or w.text for s in doc.sentences for w in s.words)
 
 
-def _norm(text: str) -> str:
-    return " ".join(text.split())
+def _chunks(text: str, size: int) -> List[str]:
+    """Режет нормализованный текст на куски ≤ *size* по пробелам."""
+    parts: List[str] = []
+    start = 0
+    while len(text) - start > size:
+        cut = text.rfind(" ", start, start + size)
+        if cut <= start:                            # «слово» длиннее size
+            parts.append(text[start:start + size])
+            start += size
+        else:
+            parts.append(text[start:cut])
+            start = cut + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _lemma(text: str) -> str:
+    # кусками: память и время одного вызова Stanza ограничены
+    return " ".join(filter(None, map(_lemma_one, _chunks(text, _LEMMA_CHUNK)))).lower()
 
 
+@lru_cache(maxsize=512)
 def _regex_word(word: str) -> re.Pattern:
-    """Точное однословное совпадение с учётом грузинского диапазона."""
-    return re.compile(
-        rf"(?<![{GE_RANGE}]){re.escape(word)}(?![{GE_RANGE}])",
-        re.I,
-    )
+    """Точное однословное совпадение с учётом грузинского диапазона.
+
+    Текст к этому моменту уже в нижнем регистре (`_norm`), поэтому вместо
+    медленного re.I приводим к нему и сам ключ.
+    """
+    return re.compile(rf"(?<![{GE_RANGE}]){re.escape(word.lower())}(?![{GE_RANGE}])")
+
+
+@lru_cache(maxsize=32)
+def _union_regex(keywords: tuple[str, ...]) -> re.Pattern:
+    """Одна регулярка-объединение всех ключей (те же границы, что в `_regex_word`)."""
+    alt = "|".join(re.escape(kw.lower()) for kw in keywords)
+    return re.compile(rf"(?<![{GE_RANGE}])(?:{alt})(?![{GE_RANGE}])")
+
+
+@lru_cache(maxsize=32)
+def _automaton(keywords: tuple[str, ...]):
+    """Aho-Corasick по всем ключам: один линейный проход вместо regex-альтернации."""
+    ac = ahocorasick.Automaton()
+    for kw in keywords:
+        ac.add_word(kw.lower(), len(kw.lower()))  # длина того, что ищем
+    ac.make_automaton()
+    return ac
+
+
+def _is_ge(ch: str) -> bool:
+    return "ა" <= ch <= "ჰ"
+
+
+def _ac_search(keywords: tuple[str, ...], haystack: str) -> bool:
+    """Есть ли ключ целым словом (те же границы, что в `_regex_word`)."""
+    last = len(haystack) - 1
+    for end, length in _automaton(keywords).iter(haystack):
+        start = end - length + 1
+        if (start == 0 or not _is_ge(haystack[start - 1])) \
+                and (end == last or not _is_ge(haystack[end + 1])):
+            return True
+    return False
 
 
 def _score(kw: str, haystack: str) -> int:
     """Строгий scorer: для фраз – fuzz.ratio, для одного слова – regex-совпадение."""
     if " " in kw:                      # фраза ≥ 2 слов
-        return fuzz.ratio(kw, haystack)
+        return fuzz.ratio(kw.lower(), haystack)
+    # `in` — подстрочный поиск в C; без подстроки regex с границами не нужен
+    if kw.lower() not in haystack:
+        return 0
     return 100 if _regex_word(kw).search(haystack) else 0
 
 
 def _hits(keywords: List[str], haystack: str, threshold: int) -> Dict[str, int]:
-    return {
-        kw: _score(kw, haystack)
-        for kw in keywords
-        if _score(kw, haystack) >= threshold
-    }
+    results: Dict[str, int] = {}
+    for kw in keywords:
+        score = _score(kw, haystack)
+        if score >= threshold:
+            results[kw] = score
+    return results
+
+
+def _any_hit(keywords: List[str], haystack: str, threshold: int) -> bool:
+    """Как `bool(_hits(...))`, но останавливается на первом совпадении."""
+    return any(_score(kw, haystack) >= threshold for kw in keywords)
 
 
 # ────────────────── public API ──────────────────
+def contains_keywords_fast(text: str, keywords: List[str]) -> bool:
+    """True, если хотя бы один ключ встречается дословно (один regex, без Stanza)."""
+    if not keywords:
+        return False
+    norm = _norm(text)
+    if ahocorasick is not None:
+        return _ac_search(tuple(keywords), norm)
+    # типичный документ ключей не содержит вовсе — отсекаем его быстрым
+    # подстрочным поиском, не запуская альтернацию с look-around
+    if not any(kw.lower() in norm for kw in keywords):
+        return False
+    return _union_regex(tuple(keywords)).search(norm) is not None
+
+
 def contains_keywords(text: str, keywords: List[str], *, threshold: int) -> bool:
     """True, если найдено ≥ 1 ключа (строгий алгоритм + леммы)."""
     norm = _norm(text)
-    if _hits(keywords, norm, threshold):
+    if _any_hit(keywords, norm, threshold):
         return True
     lemma = _lemma(norm)
-    return bool(lemma) and _hits(keywords, lemma, threshold)
+    return bool(lemma) and _any_hit(keywords, lemma, threshold)
 
 
 def find_keyword_hits(
@@ -81,6 +192,8 @@ def find_keyword_hits(
     """Вернуть dict {keyword: score} — на строгом алгоритме (без partial_ratio)."""
     norm = _norm(text)
     hits = _hits(keywords, norm, threshold)
+    if len(hits) == len(keywords):       # всё уже найдено — леммы ничего не добавят
+        return hits
 
     lemma = _lemma(norm)
     if lemma:
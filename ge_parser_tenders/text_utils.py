@@ -11,7 +11,7 @@ def normalize(text: str) -> str:
 @functools.lru_cache(maxsize=256)
 def _kw_regex(kw: str) -> re.Pattern:
     """Регулярка «целое грузинское слово kw»."""
-    return re.compile(f"{GE_WORD_BOUND}{re.escape(kw)}{GE_WORD_BOUND}", re.I)
+    return re.compile(f"{GE_WORD_BOUND}{re.escape(kw.lower())}{GE_WORD_BOUND}")
 
 def has_keyword(text: str, keywords: list[str]) -> bool:
     nt = normalize(text)